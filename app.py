@@ -15,11 +15,16 @@ import mimetypes
 from flask import Flask, request, jsonify, render_template, send_file
 from werkzeug.utils import secure_filename
 import threading
+from model_router import ModelRouter
+import sqlite3
+from search_index import SEARCH_FACETS, SEARCH_MAX_PER_PAGE, init_search_index, connect_search_index, index_metadata, search_metadata
 
 load_dotenv()
 
 app = Flask(__name__)
 
+init_search_index()
+
 llm = AzureChatOpenAI(
     api_key=os.getenv("AZURE_OPENAI_API_KEY"),
     api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
@@ -27,6 +32,18 @@ llm = AzureChatOpenAI(
     temperature=0,
 )
 
+# Cheaper deployment for short inputs; falls back to the main deployment when not configured
+if os.getenv("AZURE_OPENAI_FAST_DEPLOYMENT"):
+    fast_llm = AzureChatOpenAI(
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        azure_deployment=os.getenv("AZURE_OPENAI_FAST_DEPLOYMENT"),
+        temperature=0,
+    )
+else:
+    fast_llm = llm
+
 # Define controlled vocabularies
 SubjectASPVocab = Literal[
     "Primary computing education", "Primary STEM education",
@@ -85,6 +102,20 @@ prompt = PromptTemplate(
     partial_variables={"format_instructions": parser.get_format_instructions()},
 )
 
+router = ModelRouter(
+    fast_llm,
+    llm,
+    prompt,
+    parser,
+    FileMetadata,
+    max_fast_chars=int(os.getenv("ROUTER_MAX_FAST_CHARS", 20000)),
+    min_confidence=float(os.getenv("ROUTER_MIN_CONFIDENCE", 0.5)),
+    cost_per_1k_tokens={
+        "fast": float(os.getenv("ROUTER_FAST_COST_PER_1K_TOKENS", 0)),
+        "strong": float(os.getenv("ROUTER_STRONG_COST_PER_1K_TOKENS", 0)),
+    },
+)
+
 def clean_metadata_folder(output_folder):
     folder = output_folder
     for filename in os.listdir(folder):
@@ -117,6 +148,8 @@ def process_zip_file(zip_path, output_folder):
     clean_metadata_folder(output_folder)
     os.makedirs(output_folder, exist_ok=True)
     temp_dir = 'temp_extracted'
+    zip_name = os.path.basename(zip_path)
+    conn = connect_search_index()
 
     try:
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
@@ -146,7 +179,7 @@ def process_zip_file(zip_path, output_folder):
                         "extracted_text": extract_text(file_path, mime_type)
                     }
 
-                    response = chain.invoke({"context": context})
+                    response = router.invoke(context)
                     results.append(response)
 
                     json_filename = os.path.splitext(filename)[0] + '.json'
@@ -156,16 +189,24 @@ def process_zip_file(zip_path, output_folder):
                     with open(json_path, 'w') as json_file:
                         json.dump(response, json_file, indent=2)
 
+                    # Key on the upload as well as the path so files from different zips don't replace each other
+                    file_key = zip_name + '/' + filename.replace(os.sep, '/')
+                    try:
+                        if not index_metadata(conn, file_key, response):
+                            print('Failed to index %s. Reason: metadata is not a JSON object' % file_key)
+                    except sqlite3.OperationalError as e:
+                        conn.rollback()
+                        print('Failed to index %s. Reason: %s' % (file_key, e))
+
                 os.remove(file_path)
 
     finally:
+        conn.close()
         if os.path.exists(temp_dir):
             shutil.rmtree(temp_dir)
     
     return results
 
-chain = prompt | llm | parser
-
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -214,5 +255,27 @@ def download_files():
     
     return send_file(zip_path, as_attachment=True)
 
+@app.route('/router-stats')
+def router_stats():
+    return jsonify(router.get_stats()), 200
+
+@app.route('/search')
+def search():
+    query = request.args.get('q', '')
+    filters = {facet: request.args[facet] for facet in SEARCH_FACETS if request.args.get(facet)}
+    try:
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', 20))
+    except ValueError:
+        return jsonify({"error": "page and per_page must be integers"}), 400
+    if page < 1 or not 1 <= per_page <= SEARCH_MAX_PER_PAGE:
+        return jsonify({"error": f"page must be >= 1 and per_page between 1 and {SEARCH_MAX_PER_PAGE}"}), 400
+
+    conn = connect_search_index()
+    try:
+        return jsonify(search_metadata(conn, query, filters, page, per_page)), 200
+    finally:
+        conn.close()
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.pydantic_v1 import ValidationError
+
+PLACEHOLDER_VALUES = {"", "unknown", "n/a", "none", "not available", "not specified"}
+
+def metadata_confidence(metadata, schema):
+    # Share of schema fields the model actually filled in rather than left as a placeholder
+    filled = 0
+    for field in schema.__fields__:
+        value = metadata.get(field)
+        if isinstance(value, list):
+            filled += bool(value)
+        elif value is not None and str(value).strip().lower() not in PLACEHOLDER_VALUES:
+            filled += 1
+    return filled / len(schema.__fields__)
+
+class ModelRouter:
+    def __init__(self, fast_llm, strong_llm, prompt, parser, schema, max_fast_chars=20000, min_confidence=0.5, cost_per_1k_tokens=None):
+        self.tiers = {"fast": fast_llm, "strong": strong_llm}
+        self.prompt = prompt
+        self.parser = parser
+        self.schema = schema
+        self.max_fast_chars = max_fast_chars
+        self.min_confidence = min_confidence
+        self.cost_per_1k_tokens = cost_per_1k_tokens or {}
+        self.stats = {
+            tier: {"calls": 0, "errors": 0, "escalations": 0, "latency_seconds": 0.0, "tokens": 0, "cost": 0.0}
+            for tier in self.tiers
+        }
+        self.lock = threading.Lock()
+
+    def choose_tier(self, context):
+        # With a single deployment, escalating would just repeat the same request
+        if self.tiers["fast"] is self.tiers["strong"]:
+            return "strong"
+        return "fast" if len(context["extracted_text"]) <= self.max_fast_chars else "strong"
+
+    def call_tier(self, tier, context):
+        start = time.perf_counter()
+        message = None
+        failed = True
+        try:
+            message = (self.prompt | self.tiers[tier]).invoke({"context": context})
+            response = self.parser.invoke(message)
+            failed = False
+            return response
+        finally:
+            latency = time.perf_counter() - start
+            usage = getattr(message, "usage_metadata", None) or {}
+            tokens = usage.get("total_tokens", 0)
+            with self.lock:
+                stats = self.stats[tier]
+                stats["calls"] += 1
+                stats["errors"] += failed
+                stats["latency_seconds"] += latency
+                stats["tokens"] += tokens
+                stats["cost"] += tokens / 1000 * self.cost_per_1k_tokens.get(tier, 0.0)
+
+    def invoke(self, context):
+        if self.choose_tier(context) == "fast":
+            try:
+                response = self.call_tier("fast", context)
+                self.schema.parse_obj(response)
+                if metadata_confidence(response, self.schema) >= self.min_confidence:
+                    return response
+            except (OutputParserException, ValidationError):
+                pass
+            except Exception as e:
+                # Deployment, rate-limit and network errors on the cheap tier shouldn't fail the batch
+                print('Fast tier failed, escalating. Reason: %s' % e)
+            with self.lock:
+                self.stats["fast"]["escalations"] += 1
+
+        return self.call_tier("strong", context)
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                tier: dict(stats, avg_latency_seconds=stats["latency_seconds"] / stats["calls"] if stats["calls"] else 0.0)
+                for tier, stats in self.stats.items()
+            }
@@ -0,0 +1,129 @@
+import json
+import sqlite3
+
+SEARCH_DB_PATH = "metadata_index.db"
+SEARCH_FACETS = ("subject", "type", "format")
+SEARCH_MAX_PER_PAGE = 100
+SEARCH_MAX_TOTAL = 10000
+
+TEXT_COLUMNS = "{title description keywords}"
+
+def create_search_schema(conn):
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY,
+            file_key TEXT NOT NULL UNIQUE,
+            metadata TEXT NOT NULL
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+            title, description, keywords, subject, type, format
+        );
+    """)
+    # Facet columns only filter; they shouldn't affect relevance
+    conn.execute("INSERT INTO files_fts (files_fts, rank) VALUES ('rank', 'bm25(1.0, 1.0, 1.0, 0.0, 0.0, 0.0)')")
+    conn.commit()
+
+def init_search_index(db_path=SEARCH_DB_PATH):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        create_search_schema(conn)
+    finally:
+        conn.close()
+
+def connect_search_index(db_path=SEARCH_DB_PATH):
+    conn = sqlite3.connect(db_path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def as_list(value):
+    # The model doesn't always honour the schema, so accept a bare string and drop anything else
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, str)]
+    return []
+
+def as_text(value):
+    return value if isinstance(value, str) else ""
+
+def facet_token(value):
+    # Hex-encode facet values so each one is a single exact token, whatever punctuation it contains
+    return value.encode("utf-8").hex()
+
+def facet_tokens(values):
+    return " ".join(sorted({facet_token(value) for value in values}))
+
+def index_metadata(conn, file_key, metadata):
+    if not isinstance(metadata, dict):
+        return False
+
+    # Re-processing the same file replaces its previous entry instead of duplicating it
+    existing = conn.execute("SELECT id FROM files WHERE file_key = ?", (file_key,)).fetchone()
+    if existing:
+        conn.execute("DELETE FROM files_fts WHERE rowid = ?", (existing[0],))
+        conn.execute("DELETE FROM files WHERE id = ?", (existing[0],))
+
+    cursor = conn.execute(
+        "INSERT INTO files (file_key, metadata) VALUES (?, ?)",
+        (file_key, json.dumps(metadata)),
+    )
+    conn.execute(
+        "INSERT INTO files_fts (rowid, title, description, keywords, subject, type, format) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            cursor.lastrowid,
+            as_text(metadata.get("title")),
+            as_text(metadata.get("description")),
+            " ".join(as_list(metadata.get("keywords"))),
+            facet_tokens(as_list(metadata.get("subject_asp")) + as_list(metadata.get("subject_aup"))),
+            facet_tokens(as_list(metadata.get("type"))),
+            facet_tokens(as_list(metadata.get("format"))),
+        ),
+    )
+    conn.commit()
+    return True
+
+def build_fts_query(query):
+    # Quote every term so user input can't be parsed as FTS5 syntax; terms are ANDed
+    terms = query.split()
+    return " ".join('"%s"' % term.replace('"', '""') for term in terms)
+
+def build_match(query, filters):
+    parts = []
+    if query.strip():
+        parts.append("%s : (%s)" % (TEXT_COLUMNS, build_fts_query(query)))
+    for facet, value in filters.items():
+        if facet not in SEARCH_FACETS:
+            raise ValueError("Unknown search facet: %s" % facet)
+        parts.append('%s : "%s"' % (facet, facet_token(value)))
+    return " AND ".join(parts)
+
+def search_metadata(conn, query="", filters=None, page=1, per_page=20):
+    match = build_match(query, filters or {})
+    if match:
+        matches = "SELECT rowid FROM files_fts WHERE files_fts MATCH ?"
+        params = [match]
+        # Facet-only searches have no relevance score, so list the newest files first
+        order = "files_fts.rank" if query.strip() else "files_fts.rowid DESC"
+        page_sql = (
+            "SELECT files.file_key, files.metadata FROM files_fts JOIN files ON files.id = files_fts.rowid"
+            f" WHERE files_fts MATCH ? ORDER BY {order} LIMIT ? OFFSET ?"
+        )
+    else:
+        matches = "SELECT id FROM files"
+        params = []
+        page_sql = "SELECT file_key, metadata FROM files ORDER BY id DESC LIMIT ? OFFSET ?"
+
+    # Counting every match of a broad query costs as much as the query itself, so stop at a cap
+    total = conn.execute(
+        f"SELECT COUNT(*) FROM ({matches} LIMIT ?)", params + [SEARCH_MAX_TOTAL + 1]
+    ).fetchone()[0]
+    rows = conn.execute(page_sql, params + [per_page, (page - 1) * per_page]).fetchall()
+
+    return {
+        "total": min(total, SEARCH_MAX_TOTAL),
+        "total_capped": total > SEARCH_MAX_TOTAL,
+        "page": page,
+        "per_page": per_page,
+        "results": [{"key": row["file_key"], "metadata": json.loads(row["metadata"])} for row in rows],
+    }
@@ -0,0 +1,75 @@
+"""Measure /search query latency on a large synthetic index.
+
+Run with: python tests/bench_search_index.py [records] [budget_ms]
+Exits non-zero if any query's median latency exceeds the budget.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import connect_search_index, create_search_schema, index_metadata, search_metadata
+
+WORDS = [
+    "robotics", "python", "lab", "lecture", "sensor", "microcontroller", "embedded", "linux",
+    "kernel", "pipeline", "cache", "memory", "interrupt", "gpio", "timer", "network",
+    "cloud", "machine", "learning", "neural", "signal", "filter", "assembly", "compiler",
+] + ["term%d" % i for i in range(2000)]
+SUBJECTS = ["Python", "Robotics", "Computing", "Embedded Systems", "Internet of Things (IoT)", "Linux", "VLSI"]
+QUERIES = [
+    ("robotics", {}),
+    ("lab", {"type": "Lab"}),
+    ("", {"format": "pdf"}),
+    ("", {"type": "Lecture"}),
+    ("", {"type": "Lab", "subject": "Python"}),
+    ("robotics python", {"format": "pdf"}),
+    ("term42 sensor", {}),
+    ("", {}),
+]
+
+
+def build_index(conn, records):
+    rng = random.Random(0)
+    for i in range(records):
+        index_metadata(conn, "bench.zip/%d.pdf" % i, {
+            "title": " ".join(rng.choices(WORDS, k=4)),
+            "description": " ".join(rng.choices(WORDS, k=20)),
+            "keywords": rng.sample(WORDS, 5),
+            "subject_asp": rng.sample(SUBJECTS, 1),
+            "subject_aup": rng.sample(SUBJECTS, 2),
+            # Skewed like a real catalog: most files are PDF lectures
+            "type": ["Lecture"] if rng.random() < 0.7 else ["Lab"],
+            "format": ["pdf"] if rng.random() < 0.9 else ["ppt"],
+        })
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 50.0
+
+    conn = connect_search_index(":memory:")
+    create_search_schema(conn)
+    start = time.perf_counter()
+    build_index(conn, records)
+    print("Indexed %d records in %.1fs" % (records, time.perf_counter() - start))
+
+    over_budget = False
+    for query, filters in QUERIES:
+        timings = []
+        for page in (1, 2, 3, 1, 2):
+            start = time.perf_counter()
+            result = search_metadata(conn, query, filters, page=page, per_page=20)
+            timings.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(timings)
+        over_budget = over_budget or median > budget_ms
+        print("%8.1f ms  total=%-6d q=%r filters=%r" % (median, result["total"], query, filters))
+
+    conn.close()
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import json
+from typing import List, Literal
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.pydantic_v1 import BaseModel, Field
+
+from model_router import ModelRouter
+
+
+class Metadata(BaseModel):
+    title: str = Field(description="Title")
+    description: str = Field(description="Description")
+    type: List[Literal["Lab", "Lecture"]] = Field(description="Type")
+    keywords: List[str] = Field(description="Keywords")
+
+
+GOOD = {"title": "Fast", "description": "Intro lab", "type": ["Lab"], "keywords": ["arm"]}
+STRONG = dict(GOOD, title="Strong")
+
+parser = JsonOutputParser(pydantic_object=Metadata)
+prompt = PromptTemplate(template="{context}", input_variables=["context"])
+
+
+class FailingChatModel(FakeListChatModel):
+    def _call(self, *args, **kwargs):
+        raise ConnectionError("deployment not found")
+
+
+def make_router(fast_responses, max_fast_chars=100):
+    fast = FakeListChatModel(responses=fast_responses)
+    strong = FakeListChatModel(responses=[json.dumps(STRONG)])
+    return ModelRouter(fast, strong, prompt, parser, Metadata, max_fast_chars=max_fast_chars, min_confidence=0.75)
+
+
+def context(text="short text"):
+    return {"extracted_text": text}
+
+
+def test_fast_tier_output_is_accepted():
+    router = make_router([json.dumps(GOOD)])
+
+    assert router.invoke(context())["title"] == "Fast"
+    stats = router.get_stats()
+    assert stats["fast"]["calls"] == 1
+    assert stats["fast"]["escalations"] == 0
+    assert stats["strong"]["calls"] == 0
+
+
+@pytest.mark.parametrize(
+    "fast_response",
+    [
+        "not json",
+        json.dumps(dict(GOOD, type=["Video"])),
+        json.dumps(dict(GOOD, description="Unknown", keywords=[])),
+    ],
+    ids=["invalid-json", "validation-failure", "low-confidence"],
+)
+def test_fast_tier_escalates(fast_response):
+    router = make_router([fast_response])
+
+    assert router.invoke(context())["title"] == "Strong"
+    stats = router.get_stats()
+    assert stats["fast"]["calls"] == 1
+    assert stats["fast"]["escalations"] == 1
+    assert stats["strong"]["calls"] == 1
+
+
+def test_fast_tier_transport_error_escalates():
+    strong = FakeListChatModel(responses=[json.dumps(STRONG)])
+    router = ModelRouter(FailingChatModel(responses=[]), strong, prompt, parser, Metadata)
+
+    assert router.invoke(context())["title"] == "Strong"
+    stats = router.get_stats()
+    assert stats["fast"]["calls"] == 1
+    assert stats["fast"]["errors"] == 1
+    assert stats["fast"]["escalations"] == 1
+    assert stats["strong"]["errors"] == 0
+
+
+def test_long_input_goes_straight_to_strong():
+    router = make_router([json.dumps(GOOD)], max_fast_chars=5)
+
+    assert router.invoke(context("much longer text"))["title"] == "Strong"
+    stats = router.get_stats()
+    assert stats["fast"]["calls"] == 0
+    assert stats["strong"]["calls"] == 1
+
+
+def test_single_deployment_skips_routing():
+    model = FakeListChatModel(responses=[json.dumps(dict(GOOD, description="Unknown", keywords=[]))])
+    router = ModelRouter(model, model, prompt, parser, Metadata, min_confidence=0.75)
+
+    router.invoke(context())
+
+    stats = router.get_stats()
+    assert stats["fast"]["calls"] == 0
+    assert stats["fast"]["escalations"] == 0
+    assert stats["strong"]["calls"] == 1
+
+
+def test_stats_accumulate_across_calls():
+    router = make_router([json.dumps(GOOD), "not json"])
+
+    router.invoke(context())
+    router.invoke(context())
+
+    stats = router.get_stats()
+    assert stats["fast"]["calls"] == 2
+    assert stats["fast"]["errors"] == 1
+    assert stats["fast"]["escalations"] == 1
+    assert stats["strong"]["calls"] == 1
+    assert stats["fast"]["avg_latency_seconds"] == pytest.approx(stats["fast"]["latency_seconds"] / 2)
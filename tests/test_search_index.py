@@ -0,0 +1,124 @@
+import pytest
+
+import search_index
+from search_index import connect_search_index, create_search_schema, index_metadata, search_metadata
+
+
+def make_metadata(title, **overrides):
+    metadata = {
+        "title": title,
+        "description": "Course material",
+        "keywords": ["arm"],
+        "subject_asp": [],
+        "subject_aup": ["Computing"],
+        "type": ["Lecture"],
+        "format": ["pdf"],
+    }
+    metadata.update(overrides)
+    return metadata
+
+
+@pytest.fixture
+def conn():
+    conn = connect_search_index(":memory:")
+    create_search_schema(conn)
+    yield conn
+    conn.close()
+
+
+def paths(result):
+    return [item["key"] for item in result["results"]]
+
+
+def test_keyword_matches_title_description_and_keywords(conn):
+    index_metadata(conn, "a.pdf", make_metadata("Robotics lab"))
+    index_metadata(conn, "b.pdf", make_metadata("Intro", description="Robotics with Arduino"))
+    index_metadata(conn, "c.pdf", make_metadata("Intro", keywords=["robotics"]))
+    index_metadata(conn, "d.pdf", make_metadata("Operating systems"))
+
+    result = search_metadata(conn, "robotics")
+
+    assert result["total"] == 3
+    assert sorted(paths(result)) == ["a.pdf", "b.pdf", "c.pdf"]
+
+
+def test_facet_filters(conn):
+    index_metadata(conn, "a.pdf", make_metadata("Lab one", type=["Lab"], subject_asp=["Python"]))
+    index_metadata(conn, "b.pdf", make_metadata("Lab two", type=["Lab"], subject_aup=["Robotics"]))
+    index_metadata(conn, "c.pdf", make_metadata("Lecture", subject_aup=["Robotics"]))
+
+    assert paths(search_metadata(conn, "", {"type": "Lab", "subject": "Robotics"})) == ["b.pdf"]
+    assert paths(search_metadata(conn, "lab", {"subject": "Python"})) == ["a.pdf"]
+    assert search_metadata(conn, "", {"format": "mp3"})["total"] == 0
+
+
+def test_paging(conn):
+    for i in range(5):
+        index_metadata(conn, f"{i}.pdf", make_metadata(f"Lecture {i}"))
+
+    first = search_metadata(conn, "lecture", page=1, per_page=2)
+    last = search_metadata(conn, "lecture", page=3, per_page=2)
+
+    assert first["total"] == 5
+    assert len(first["results"]) == 2
+    assert len(last["results"]) == 1
+    all_paths = paths(first) + paths(search_metadata(conn, "lecture", page=2, per_page=2)) + paths(last)
+    assert sorted(all_paths) == [f"{i}.pdf" for i in range(5)]
+
+
+def test_reindexing_same_key_replaces_entry(conn):
+    index_metadata(conn, "course.zip/a.pdf", make_metadata("Old title", type=["Lab"]))
+    index_metadata(conn, "course.zip/a.pdf", make_metadata("New title", type=["Video"]))
+
+    assert search_metadata(conn, "")["total"] == 1
+    assert search_metadata(conn, "old")["total"] == 0
+    assert paths(search_metadata(conn, "new")) == ["course.zip/a.pdf"]
+    assert search_metadata(conn, "", {"type": "Lab"})["total"] == 0
+    assert search_metadata(conn, "", {"type": "Video"})["total"] == 1
+
+
+def test_same_path_in_different_uploads_is_kept(conn):
+    index_metadata(conn, "course.zip/README.md", make_metadata("Course readme"))
+    index_metadata(conn, "labs.zip/README.md", make_metadata("Labs readme"))
+
+    assert sorted(paths(search_metadata(conn, "readme"))) == ["course.zip/README.md", "labs.zip/README.md"]
+
+
+def test_facet_values_match_exactly(conn):
+    index_metadata(conn, "a.pdf", make_metadata("A", subject_aup=["Internet of Things (IoT)"], subject_asp=["micro:bit v1"]))
+    index_metadata(conn, "b.pdf", make_metadata("B", subject_aup=["Computing"], subject_asp=["micro:bit"]))
+
+    assert paths(search_metadata(conn, "", {"subject": "Internet of Things (IoT)"})) == ["a.pdf"]
+    assert paths(search_metadata(conn, "", {"subject": "micro:bit"})) == ["b.pdf"]
+    assert search_metadata(conn, "", {"subject": "Internet"})["total"] == 0
+
+
+def test_total_is_capped(conn, monkeypatch):
+    monkeypatch.setattr(search_index, "SEARCH_MAX_TOTAL", 3)
+    for i in range(5):
+        index_metadata(conn, f"{i}.pdf", make_metadata(f"Lecture {i}"))
+
+    for result in (search_metadata(conn, "lecture"), search_metadata(conn, "", {"format": "pdf"}), search_metadata(conn, "")):
+        assert result["total"] == 3
+        assert result["total_capped"]
+    assert not search_metadata(conn, "lecture 1")["total_capped"]
+
+
+def test_unknown_facet_is_rejected(conn):
+    with pytest.raises(ValueError):
+        search_metadata(conn, "", {"title": "x"})
+
+
+@pytest.mark.parametrize("query", ['"', 'NEAR(', '*', 'title:', 'a AND', '-x', '(""'])
+def test_fts_syntax_is_treated_as_text(conn, query):
+    index_metadata(conn, "a.pdf", make_metadata("Robotics"))
+
+    assert search_metadata(conn, query)["total"] == 0
+
+
+def test_malformed_metadata_is_normalised(conn):
+    assert index_metadata(conn, "a.pdf", make_metadata("Robotics", subject_asp="Python", keywords=None, type=[1, "Lab"]))
+    assert not index_metadata(conn, "b.pdf", ["not", "a", "dict"])
+
+    assert paths(search_metadata(conn, "", {"subject": "Python", "type": "Lab"})) == ["a.pdf"]
+    assert search_metadata(conn, "")["total"] == 1